@@ -1,249 +1,165 @@
 from typing import Annotated, Optional
 from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import event, update
 from sqlmodel import Field, Session, SQLModel, create_engine, select
-from pydantic import validator
+from pydantic import AfterValidator, StringConstraints, ValidationInfo, field_validator
+import os
 import re
 from datetime import datetime
 
+_DIGITS5 = re.compile(r'\A\d{5}\Z').match
+_DIGITS6 = re.compile(r'\A\d{6}\Z').match
+_STID = re.compile(r'\A403114150\d{2}\Z').match
+_BIRTH_DATE = re.compile(r'\A(13\d{2}|1400)/(0?[1-9]|1[0-2])/(0?[1-9]|[12]\d|3[01])\Z').match
+
+def _is_persian(v: str) -> bool:
+    return bool(v) and all(0x0600 <= ord(c) <= 0x06FF or c.isspace() for c in v)
+
+def _check_persian(v: str) -> str:
+    if not _is_persian(v):
+        raise ValueError("باید فقط حاوی کاراکترهای فارسی و فاصله باشد")
+    return v
+
+PersianStr = Annotated[str, AfterValidator(_check_persian)]
+
+_CITIES = frozenset({
+    "تهران", "مشهد", "اصفهان", "کرج", "شیراز", "تبریز", "قم", "اهواز", "کرمانشاه",
+    "ارومیه", "رشت", "زاهدان", "همدان", "کرمان", "یزد", "اردبیل", "بندرعباس",
+    "اراک", "اسلامشهر", "زنجان", "سنندج", "قزوین", "خرم آباد", "گرگان",
+    "ساری", "بجنورد", "بوشهر", "بیرجند", "ایلام", "شهرکرد", "یاسوج"
+})
+_DEPARTMENTS = frozenset({"فنی مهندسی", "علوم پایه", "اقتصاد"})
+_IDS_LETTERS = frozenset("الفبپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی")
+_MARRIED = frozenset({"مجرد", "متاهل"})
+_MAJORS = {
+    "فنی مهندسی": frozenset({
+        "مهندسی کامپیوتر", "مهندسی برق", "مهندسی مکانیک", "مهندسی عمران",
+        "مهندسی صنایع", "مهندسی شیمی", "مهندسی مواد", "مهندسی هوافضا",
+        "مهندسی نفت", "مهندسی معماری"
+    }),
+    "علوم پایه": frozenset({
+        "ریاضی", "فیزیک", "شیمی", "زیست‌شناسی", "زمین‌شناسی",
+        "آمار", "علوم کامپیوتر", "بیوشیمی", "میکروبیولوژی", "ژنتیک"
+    }),
+    "اقتصاد": frozenset({
+        "اقتصاد", "مدیریت بازرگانی", "حسابداری", "مدیریت مالی",
+        "مدیریت صنعتی", "اقتصاد کشاورزی", "اقتصاد بین‌الملل",
+        "بانکداری", "بیمه", "مدیریت دولتی"
+    }),
+}
+
+
+def _validate_major(v: str, info: ValidationInfo) -> str:
+    department = info.data.get("department")
+    if department not in _MAJORS:
+        raise ValueError("دانشکده نامعتبر است")
+    if v not in _MAJORS[department]:
+        raise ValueError(f"رشته {v} با دانشکده {department} سازگار نیست")
+    return v
+
 class Person(SQLModel):
-    fname: str
-    lname: str
+    fname: PersianStr
+    lname: PersianStr
     birth_date: str
-    born_city: str
-    address: str = Field(max_length=100)
-    postal_code: str = Field(max_length=10, min_length=10)
-    cphone: str
-    hphone: str
-
-    @validator("fname", pre=True)
-    def validate_student_fname(cls, v):
-        if not isinstance(v, str) or not re.match(r'^[\u0600-\u06FF\s]+$', v):
-            raise ValueError("نام باید فقط حاوی کاراکترهای فارسی و فاصله باشد")
-        return v
-
-    @validator("lname", pre=True)
-    def validate_student_lname(cls, v):
-        if not isinstance(v, str) or not re.match(r'^[\u0600-\u06FF\s]+$', v):
-            raise ValueError("نام خانوادگی باید فقط حاوی کاراکترهای فارسی و فاصله باشد")
-        return v
-    
-    @validator("born_city", pre=True)
-    def validate_born_city(cls, v):
-        cities = [
-            "تهران", "مشهد", "اصفهان", "کرج", "شیراز", "تبریز", "قم", "اهواز", "کرمانشاه",
-            "ارومیه", "رشت", "زاهدان", "همدان", "کرمان", "یزد", "اردبیل", "بندرعباس",
-            "اراک", "اسلامشهر", "زنجان", "سنندج", "قزوین", "خرم آباد", "گرگان",
-            "ساری", "بجنورد", "بوشهر", "بیرجند", "ایلام", "شهرکرد", "یاسوج"
-        ]
-        if not isinstance(v, str) or v not in cities:
+    born_city: str = Field(index=True)
+    address: PersianStr = Field(max_length=100)
+    postal_code: Annotated[str, StringConstraints(pattern=r'^\d{10}$')] = Field(max_length=10, min_length=10)
+    cphone: Annotated[str, StringConstraints(pattern=r'^09\d{9}$')]
+    hphone: Annotated[str, StringConstraints(pattern=r'^0\d{2,3}\d{8}$')]
+
+    @field_validator("born_city")
+    @classmethod
+    def validate_born_city(cls, v: str) -> str:
+        if v not in _CITIES:
             raise ValueError("شهر باید یکی از مراکز استان باشد")
         return v
 
-    @validator("birth_date", pre=True)
-    def validate_birth_date(cls, v):
-        if not isinstance(v, str):
-            raise ValueError("تاریخ تولد باید رشته باشد")
-        try:
-            year, month, day = map(int, v.split("/"))
-            if not (1300 <= year <= 1400 and 1 <= month <= 12 and 1 <= day <= 31):
-                raise ValueError("سال باید بین ۱۳۰۰ تا ۱۴۰۰، ماه بین ۱ تا ۱۲ و روز بین ۱ تا ۳۱ باشد")
-        except:
-            raise ValueError("فرمت تاریخ باید به صورت شمسی YYYY/MM/DD باشد")
-        return v
-
-    @validator("address", pre=True)
-    def validate_address(cls, v):
-        if not isinstance(v, str) or len(v) > 100 or not re.match(r'^[\u0600-\u06FF\s]+$', v):
-            raise ValueError("آدرس باید حداکثر ۱۰۰ کاراکتر و شامل حروف فارسی باشد")
-        return v
-
-    @validator("postal_code", pre=True)
-    def validate_postal_code(cls, v):
-        if not isinstance(v, str) or not (v.isdigit() and len(v) == 10):
-            raise ValueError("کد پستی باید عدد ۱۰ رقمی باشد")
-        return v  
-
-    @validator("cphone")
-    def validate_cphone(cls, v):
-        if not re.match(r'^09\d{9}$', v):
-            raise ValueError("تلفن همراه باید مطابق استاندارد ایران باشد")
-        return v
-
-    @validator("hphone")
-    def validate_hphone(cls, v):
-        if not re.match(r'^0\d{2,3}\d{8}$', v):
-            raise ValueError("تلفن ثابت باید مطابق استاندارد ایران باشد")
+    @field_validator("birth_date")
+    @classmethod
+    def validate_birth_date(cls, v: str) -> str:
+        if not _BIRTH_DATE(v):
+            raise ValueError("فرمت تاریخ باید به صورت شمسی YYYY/MM/DD و بین ۱۳۰۰ تا ۱۴۰۰ باشد")
         return v
 
 class Student(Person, table=True):
     stid: str = Field(primary_key=True)
-    father: str
-    ids_number: str = Field(max_length=6, min_length=6)
+    father: PersianStr
+    ids_number: Annotated[str, StringConstraints(pattern=r'^\d{6}$')] = Field(max_length=6, min_length=6)
     ids_letter: str = Field(max_length=1)
-    ids_code: str = Field(max_length=2, min_length=2)
-    department: str
-    major: str
+    ids_code: Annotated[str, StringConstraints(pattern=r'^\d{2}$')] = Field(max_length=2, min_length=2)
+    department: str = Field(index=True)
+    major: str = Field(index=True)
     married: str
-    id: str = Field(max_length=10, min_length=10)
+    id: Annotated[str, StringConstraints(pattern=r'^\d{10}$')] = Field(max_length=10, min_length=10)
 
     class Config:
         validate_assignment = True
         extra = "forbid"
         strict = True
 
-    @validator("stid", pre=True)
-    def validate_stid(cls, v):
-        if not isinstance(v, str) or not (v.startswith("403114150") and len(v) == 11 and v[9:].isdigit()):
+    @field_validator("stid")
+    @classmethod
+    def validate_stid(cls, v: str) -> str:
+        if not _STID(v):
             raise ValueError("شماره دانشجویی باید با 403114150 شروع شده و همه کاراکترهای آن عدد باشد")
         return v
 
-
-    @validator("father", pre=True)
-    def validate_father(cls, v):
-        if not isinstance(v, str) or not re.match(r'^[\u0600-\u06FF\s]+$', v):
-            raise ValueError("نام پدر باید فقط حاوی کاراکترهای فارسی و فاصله باشد")
-        return v
-
-    @validator("ids_number", pre=True)
-    def validate_ids_number(cls, v):
-        if not isinstance(v, str) or not (v.isdigit() and len(v) == 6):
-            raise ValueError("سریال شناسنامه باید عدد ۶ رقمی باشد")
-        return v
-
-    @validator("ids_letter", pre=True)
-    def validate_ids_letter(cls, v):
-        persian_letters = "الفبپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی"
-        if not isinstance(v, str) or v not in persian_letters:
+    @field_validator("ids_letter")
+    @classmethod
+    def validate_ids_letter(cls, v: str) -> str:
+        if v not in _IDS_LETTERS:
             raise ValueError("حرف سریال شناسنامه باید یکی از حروف الفبای فارسی باشد")
         return v
 
-    @validator("ids_code", pre=True)
-    def validate_ids_code(cls, v):
-        if not isinstance(v, str) or not (v.isdigit() and len(v) == 2):
-            raise ValueError("کد سریال شناسنامه باید عدد ۲ رقمی باشد")
-        return v
-
-    @validator("cphone")
-    def validate_cphone(cls, v):
-        if not re.match(r'^09\d{9}$', v):
-            raise ValueError("تلفن همراه باید مطابق استاندارد ایران باشد (مثال:*********09")
-        return v
-
-    @validator("hphone", pre=True)
-    def validate_hphone(cls, v):
-        if not isinstance(v, str) or not re.match(r'^0\d{2,3}\d{8}$', v):
-            raise ValueError("تلفن ثابت باید مطابق استاندارد ایران باشد (مثال:********021)")
-        return v
-
-    @validator("department", pre=True)
-    def validate_department(cls, v):
-        departments = ["فنی مهندسی", "علوم پایه", "اقتصاد"]
-        if not isinstance(v, str) or v not in departments:
+    @field_validator("department")
+    @classmethod
+    def validate_department(cls, v: str) -> str:
+        if v not in _DEPARTMENTS:
             raise ValueError("دانشکده باید یکی از فنی مهندسی، علوم پایه یا اقتصاد باشد")
         return v
 
-    @validator("major", pre=True)
-    def validate_major(cls, v, values):
-        majors = {
-            "فنی مهندسی": [
-                "مهندسی کامپیوتر", "مهندسی برق", "مهندسی مکانیک", "مهندسی عمران",
-                "مهندسی صنایع", "مهندسی شیمی", "مهندسی مواد", "مهندسی هوافضا",
-                "مهندسی نفت", "مهندسی معماری"
-            ],
-            "علوم پایه": [
-                "ریاضی", "فیزیک", "شیمی", "زیست‌شناسی", "زمین‌شناسی",
-                "آمار", "علوم کامپیوتر", "بیوشیمی", "میکروبیولوژی", "ژنتیک"
-            ],
-            "اقتصاد": [
-                "اقتصاد", "مدیریت بازرگانی", "حسابداری", "مدیریت مالی",
-                "مدیریت صنعتی", "اقتصاد کشاورزی", "اقتصاد بین‌الملل",
-                "بانکداری", "بیمه", "مدیریت دولتی"
-            ]
-        }
-        if not isinstance(v, str):
-            raise ValueError("رشته تحصیلی باید رشته باشد")
-        department = values.get("department")
-        if department not in majors:
-            raise ValueError("دانشکده نامعتبر است")
-        if v not in majors[department]:
-            raise ValueError(f"رشته {v} با دانشکده {department} سازگار نیست")
-        return v
-
-    @validator("married", pre=True)
-    def validate_married(cls, v):
-        if not isinstance(v, str) or v not in ["مجرد", "متاهل"]:
+    @field_validator("married")
+    @classmethod
+    def validate_married(cls, v: str) -> str:
+        if v not in _MARRIED:
             raise ValueError("وضعیت تاهل باید مجرد یا متاهل باشد")
         return v
 
-    @validator("id", pre=True)
-    def validate_id(cls, v):
-        if not isinstance(v, str) or not (v.isdigit() and len(v) == 10):
-            raise ValueError("کد ملی باید عدد ۱۰ رقمی باشد")
-        return v
+    validate_major = field_validator("major")(_validate_major)
 
 class Teacher(Person , table=True):
     lid: str = Field(primary_key=True)
-    national_id: str
-    department: str
-    major: str
+    national_id: Annotated[str, StringConstraints(pattern=r'^\d{10}$')]
+    department: str = Field(index=True)
+    major: str = Field(index=True)
 
     class Config:
         validate_assignment = True
         extra = "forbid"
         strict = True
 
-    @validator("lid")
-    def validate_lid(cls, v):
-        if not v.isdigit() or len(v) != 6:
+    @field_validator("lid")
+    @classmethod
+    def validate_lid(cls, v: str) -> str:
+        if not _DIGITS6(v):
             raise ValueError("کد استاد باید عدد ۶ رقمی باشد")
         return v
 
-
-    @validator("national_id")
-    def validate_national_id(cls, v):
-        if not v.isdigit() or len(v) != 10:
-            raise ValueError("کد ملی باید عدد ۱۰ رقمی باشد")
-        return v
-
-    @validator("department")
-    def validate_department(cls, v):
-        departments = ["فنی مهندسی", "علوم پایه", "اقتصاد"]
-        if v not in departments:
+    @field_validator("department")
+    @classmethod
+    def validate_department(cls, v: str) -> str:
+        if v not in _DEPARTMENTS:
             raise ValueError("دانشکده باید یکی از مجازها باشد")
         return v
 
-    @validator("major", pre=True)
-    def validate_major(cls, v, values):
-        majors = {
-            "فنی مهندسی": [
-                "مهندسی کامپیوتر", "مهندسی برق", "مهندسی مکانیک", "مهندسی عمران",
-                "مهندسی صنایع", "مهندسی شیمی", "مهندسی مواد", "مهندسی هوافضا",
-                "مهندسی نفت", "مهندسی معماری"
-            ],
-            "علوم پایه": [
-                "ریاضی", "فیزیک", "شیمی", "زیست‌شناسی", "زمین‌شناسی",
-                "آمار", "علوم کامپیوتر", "بیوشیمی", "میکروبیولوژی", "ژنتیک"
-            ],
-            "اقتصاد": [
-                "اقتصاد", "مدیریت بازرگانی", "حسابداری", "مدیریت مالی",
-                "مدیریت صنعتی", "اقتصاد کشاورزی", "اقتصاد بین‌الملل",
-                "بانکداری", "بیمه", "مدیریت دولتی"
-            ]
-        }
-        if not isinstance(v, str):
-            raise ValueError("رشته تحصیلی باید رشته باشد")
-        department = values.get("department")
-        if department not in majors:
-            raise ValueError("دانشکده نامعتبر است")
-        if v not in majors[department]:
-            raise ValueError(f"رشته {v} با دانشکده {department} سازگار نیست")
-        return v
+    validate_major = field_validator("major")(_validate_major)
 
 
 class Course(SQLModel, table=True):
     cid: str = Field(primary_key=True)
-    cname: str
-    department: str
+    cname: PersianStr = Field(max_length=25)
+    department: str = Field(index=True)
     credit: int
 
     class Config:
@@ -251,67 +167,97 @@ class Course(SQLModel, table=True):
         extra = "forbid"
         strict = True
 
-    @validator("cid")
-    def validate_cid(cls, v):
-        if not v.isdigit() or len(v) != 5:
+    @field_validator("cid")
+    @classmethod
+    def validate_cid(cls, v: str) -> str:
+        if not _DIGITS5(v):
             raise ValueError("کد درس باید عدد ۵ رقمی باشد")
         return v
 
-    @validator("cname")
-    def validate_cname(cls, v):
-        if not isinstance(v, str) or not re.fullmatch(r'[آ-ی\s]{1,25}', v):
-            raise ValueError("نام درس باید فقط حروف فارسی و حداکثر ۲۵ کاراکتر باشد")
-        return v
-
-    @validator("department")
-    def validate_department(cls, v):
-        departments = ["فنی مهندسی", "علوم پایه", "اقتصاد"]
-        if v not in departments:
+    @field_validator("department")
+    @classmethod
+    def validate_department(cls, v: str) -> str:
+        if v not in _DEPARTMENTS:
             raise ValueError("دانشکده معتبر نیست")
         return v
 
-    @validator("credit")
-    def validate_credit(cls, v):
-        if not isinstance(v, int) or not (1 <= v <= 4):
+    @field_validator("credit")
+    @classmethod
+    def validate_credit(cls, v: int) -> int:
+        if not (1 <= v <= 4):
             raise ValueError("تعداد واحد باید بین ۱ تا ۴ باشد")
         return v
 
+Student.model_rebuild(force=True)
+Teacher.model_rebuild(force=True)
+Course.model_rebuild(force=True)
+
+_STUDENT_FIELDS = frozenset(Student.model_fields)
+
 sqlite_file_name = "database.db"
 sqlite_url = f"sqlite:///{sqlite_file_name}"
 
 connect_args = {"check_same_thread": False}
 engine = create_engine(sqlite_url, connect_args=connect_args)
 
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
 
 def get_session():
-    with Session(engine) as session:
+    with Session(engine, expire_on_commit=False) as session:
         yield session
 
 SessionDep = Annotated[Session, Depends(get_session)]
 
-app = FastAPI()
-
-@app.on_event("startup")
-def on_startup():
-    create_db_and_tables()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 @app.post("/students/")
 def create_student(student: Student, session: SessionDep) -> Student:
     session.add(student)
     session.commit()
-    session.refresh(student)
     return student
 
+@app.post("/students/bulk")
+def bulk_create_students(students: list[Student], session: SessionDep):
+    session.add_all(students)
+    session.commit()
+    return {"count": len(students)}
+
 @app.get("/students/")
 def read_students(
     session: SessionDep,
-    offset: int = 0,
+    after: str | None = None,
     limit: Annotated[int, Query(le=100)] = 100,
-) -> list[Student]:
-    students = session.exec(select(Student).offset(offset).limit(limit)).all()
-    return students
+    fields: str | None = None,
+):
+    if fields is None:
+        stmt = select(Student).order_by(Student.stid).limit(limit)
+        if after:
+            stmt = stmt.where(Student.stid > after)
+        students = session.exec(stmt).all()
+        return {"items": students, "next": students[-1].stid if students else None}
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    if not names or any(name not in _STUDENT_FIELDS for name in names):
+        raise HTTPException(status_code=422, detail="فیلد درخواستی نامعتبر است")
+    if "stid" not in names:
+        names.append("stid")
+    columns = [getattr(Student, name) for name in names]
+    stmt = select(*columns).order_by(Student.stid).limit(limit)
+    if after:
+        stmt = stmt.where(Student.stid > after)
+    rows = session.execute(stmt).mappings().all()
+    items = [dict(row) for row in rows]
+    return {"items": items, "next": items[-1]["stid"] if items else None}
 
 @app.get("/students/{stid}")
 def read_student(stid: str, session: SessionDep) -> Student:
@@ -322,16 +268,13 @@ def read_student(stid: str, session: SessionDep) -> Student:
 
 @app.put("/students/{stid}")
 def update_student(stid: str, student: Student, session: SessionDep) -> Student:
-    db_student = session.get(Student, stid)
-    if not db_student:
+    data = {key: getattr(student, key) for key in student.model_fields_set - {"stid"}}
+    stmt = update(Student).where(Student.stid == stid).values(**data)
+    result = session.exec(stmt)
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="دانشجو یافت نشد")
-    student_data = student.dict(exclude_unset=True)
-    for key, value in student_data.items():
-        setattr(db_student, key, value)
-    session.add(db_student)
     session.commit()
-    session.refresh(db_student)
-    return db_student
+    return student
 
 @app.delete("/students/{stid}")
 def delete_student(stid: str, session: SessionDep):
@@ -346,16 +289,19 @@ def delete_student(stid: str, session: SessionDep):
 def create_teacher(teacher: Teacher, session: SessionDep) -> Teacher:
     session.add(teacher)
     session.commit()
-    session.refresh(teacher)
     return teacher
 
 @app.get("/teachers/")
 def read_teachers(
     session: SessionDep,
-    offset: int = 0,
+    after: str | None = None,
     limit: Annotated[int, Query(le=100)] = 100,
-) -> list[Teacher]:
-    return session.exec(select(Teacher).offset(offset).limit(limit)).all()
+):
+    stmt = select(Teacher).order_by(Teacher.lid).limit(limit)
+    if after:
+        stmt = stmt.where(Teacher.lid > after)
+    teachers = session.exec(stmt).all()
+    return {"items": teachers, "next": teachers[-1].lid if teachers else None}
 
 @app.get("/teachers/{lid}")
 def read_teacher(lid: str, session: SessionDep) -> Teacher:
@@ -366,16 +312,13 @@ def read_teacher(lid: str, session: SessionDep) -> Teacher:
 
 @app.put("/teachers/{lid}")
 def update_teacher(lid: str, teacher: Teacher, session: SessionDep) -> Teacher:
-    db_teacher = session.get(Teacher, lid)
-    if not db_teacher:
+    data = {key: getattr(teacher, key) for key in teacher.model_fields_set - {"lid"}}
+    stmt = update(Teacher).where(Teacher.lid == lid).values(**data)
+    result = session.exec(stmt)
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="استاد یافت نشد")
-    teacher_data = teacher.dict(exclude_unset=True)
-    for key, value in teacher_data.items():
-        setattr(db_teacher, key, value)
-    session.add(db_teacher)
     session.commit()
-    session.refresh(db_teacher)
-    return db_teacher
+    return teacher
 
 @app.delete("/teachers/{lid}")
 def delete_teacher(lid: str, session: SessionDep):
@@ -390,16 +333,19 @@ def delete_teacher(lid: str, session: SessionDep):
 def create_course(course: Course, session: SessionDep) -> Course:
     session.add(course)
     session.commit()
-    session.refresh(course)
     return course
 
 @app.get("/courses/")
 def read_courses(
     session: SessionDep,
-    offset: int = 0,
+    after: str | None = None,
     limit: Annotated[int, Query(le=100)] = 100,
-) -> list[Course]:
-    return session.exec(select(Course).offset(offset).limit(limit)).all()
+):
+    stmt = select(Course).order_by(Course.cid).limit(limit)
+    if after:
+        stmt = stmt.where(Course.cid > after)
+    courses = session.exec(stmt).all()
+    return {"items": courses, "next": courses[-1].cid if courses else None}
 
 @app.get("/courses/{cid}")
 def read_course(cid: str, session: SessionDep) -> Course:
@@ -410,16 +356,13 @@ def read_course(cid: str, session: SessionDep) -> Course:
 
 @app.put("/courses/{cid}")
 def update_course(cid: str, course: Course, session: SessionDep) -> Course:
-    db_course = session.get(Course, cid)
-    if not db_course:
+    data = {key: getattr(course, key) for key in course.model_fields_set - {"cid"}}
+    stmt = update(Course).where(Course.cid == cid).values(**data)
+    result = session.exec(stmt)
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="درس یافت نشد")
-    course_data = course.dict(exclude_unset=True)
-    for key, value in course_data.items():
-        setattr(db_course, key, value)
-    session.add(db_course)
     session.commit()
-    session.refresh(db_course)
-    return db_course
+    return course
 
 @app.delete("/courses/{cid}")
 def delete_course(cid: str, session: SessionDep):
@@ -429,3 +372,6 @@ def delete_course(cid: str, session: SessionDep):
     session.delete(course)
     session.commit()
     return {"ok": True}
+
+if os.environ.get("BOLG_CREATE_TABLES", "1") == "1":
+    create_db_and_tables()